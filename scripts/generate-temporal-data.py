@@ -5,15 +5,51 @@ This script traverses the repository, finds all projects with click.md files,
 and generates a JSON file with complete commit history and blame information.
 """
 
+import contextlib
+import io
 import json
+import mmap
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple, Union
+
+try:
+    # Optional: much faster serialization of the (large) output file
+    import orjson
+except ImportError:
+    orjson = None
+
+# Marks the start of each commit header in multi-line git log output
+COMMIT_SENTINEL = "\x01"
+
+# Image references in click.md: markdown ![alt](path) and HTML <img src="path">
+_MD_IMG_RE = re.compile(rb'!\[([^\]]*)\]\(([^)]+)\)')
+_HTML_IMG_RE = re.compile(rb'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+_EXTERNAL_URL_PREFIXES = ('http://', 'https://', '//')
+
+# Directories that never contain projects, skipped when walking the filesystem
+_SKIP_DIRS = {'.git', 'node_modules', 'dist', '__pycache__', '.venv', 'target'}
+
+# Bumped whenever the shape of blame records changes, invalidating old caches
+BLAME_CACHE_VERSION = 2
+
+# Blame of lines that are not committed yet
+UNCOMMITTED_SHA = "0" * 40
+
+# Commit indexes by git root and cached blame records by click.md path,
+# content oid and last commit, set in each project worker by _init_worker
+_commit_indexes: Dict[str, Dict[str, Any]] = {}
+_blame_cache: Dict[str, List[Dict[str, Any]]] = {}
 
 
 def run_git_command(cmd: List[str], cwd: Optional[str] = None) -> str:
@@ -32,79 +68,193 @@ def run_git_command(cmd: List[str], cwd: Optional[str] = None) -> str:
         return ""
 
 
-def get_all_commits(repo_path: str) -> List[Dict[str, Any]]:
-    """Get all commits in the repository."""
-    commits = []
-    
-    # Get commit info with format: SHA|AUTHOR|EMAIL|DATE|MESSAGE
-    log_format = "%H|%an|%ae|%aI|%s"
-    output = run_git_command(
-        ["git", "log", f"--pretty=format:{log_format}", "--all"],
-        cwd=repo_path
-    )
-    
-    if not output:
-        return commits
+def run_git_streaming(cmd: List[str], cwd: Optional[str] = None, separator: str = '\n') -> Iterator[str]:
+    """Run a git command and yield its output record by record as it is produced.
+
+    Records are lines by default; pass separator='\\0' for -z output.
+    """
+    # stderr goes to a file rather than a pipe: a pipe that is only read after
+    # stdout ends would block git (and us) once it fills up
+    with tempfile.TemporaryFile(mode='w+') as stderr:
+        process = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=stderr
+        )
+        # NUL-separated records are passed through untranslated
+        stdout = io.TextIOWrapper(
+            process.stdout,
+            encoding='utf-8',
+            errors='replace',
+            newline=None if separator == '\n' else ''
+        )
+        try:
+            if separator == '\n':
+                for line in stdout:
+                    yield line.rstrip('\n')
+            else:
+                pending = ''
+                for chunk in iter(lambda: stdout.read(65536), ''):
+                    *records, pending = (pending + chunk).split(separator)
+                    yield from records
+                if pending:
+                    yield pending
+            process.wait()
+            if process.returncode != 0:
+                stderr.seek(0)
+                print(f"Error running git command {' '.join(cmd)}: {stderr.read()}", file=sys.stderr)
+        finally:
+            stdout.close()
+            process.wait()
+
+
+def get_object_sizes(repo_path: str, object_names: List[str]) -> List[int]:
+    """Get the size of each git object (e.g. SHA:PATH) using a single cat-file process."""
+    if not object_names:
+        return []
     
-    for line in output.split('\n'):
-        if not line:
-            continue
-        parts = line.split('|', 4)
-        if len(parts) == 5:
-            sha, author, email, date, message = parts
-            
-            # Get files changed in this commit
-            files_output = run_git_command(
-                ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", sha],
-                cwd=repo_path
-            )
-            files = [f for f in files_output.split('\n') if f]
-            
-            commits.append({
-                "sha": sha,
-                "author": author,
-                "email": email,
-                "date": date,
-                "message": message,
-                "files": files
-            })
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check=%(objectsize)"],
+            cwd=repo_path,
+            input="".join(f"{name}\n" for name in object_names),
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Error running git cat-file for {len(object_names)} objects: {e.stderr}", file=sys.stderr)
+        return [0] * len(object_names)
     
-    return commits
+    # One line per object: its size, or "<name> missing" if it does not exist
+    return [int(line) if line.isdigit() else 0 for line in result.stdout.split('\n')[:len(object_names)]]
 
 
-def get_click_file_commits(repo_path: str, click_file_path: str) -> List[Dict[str, Any]]:
-    """Get all commits that modified the click.md file."""
+def get_commit_index(repo_path: str) -> Dict[str, Any]:
+    """Get all commits in the repository, indexed by the files each commit changed.
+
+    The log is read in a single pass; per-file histories are then looked up
+    in memory with get_file_history instead of running git log per file.
+    The commit list covers all refs, but only commits reachable from HEAD
+    are indexed by file, so file histories describe the checked-out files
+    just like git log --follow from HEAD.
+    """
     commits = []
-    
-    # Get commit info for specific file
-    log_format = "%H|%an|%ae|%aI|%s"
-    output = run_git_command(
-        ["git", "log", f"--pretty=format:{log_format}", "--follow", "--", click_file_path],
-        cwd=repo_path
-    )
-    
-    if not output:
-        return commits
-    
-    for line in output.split('\n'):
-        if not line:
+    # file path -> [(commit index, path before the commit if it renamed the file)]
+    file_commits: Dict[str, List[Tuple[int, Optional[str]]]] = {}
+    
+    head_shas = set(run_git_command(["git", "rev-list", "HEAD"], cwd=repo_path).split())
+    
+    # Paths in the log are relative to the repository top level, while
+    # repo_path may be a subdirectory of it
+    prefix = run_git_command(["git", "rev-parse", "--show-prefix"], cwd=repo_path)
+    
+    # Get commit info with format: SHA|AUTHOR|EMAIL|DATE|MESSAGE, each header
+    # prefixed with COMMIT_SENTINEL (%x01) and followed by the files changed
+    # in the commit. With -z every field is NUL-terminated and paths are never
+    # C-quoted: the header and the first status share a record
+    # (HEADER\nSTATUS), then PATH, or OLD, NEW for renames and copies.
+    # --date-order lists children before parents even when timestamps tie,
+    # which get_file_history relies on for newest-first order
+    log_format = "%x01%H|%an|%ae|%aI|%s"
+    files = None
+    status = None
+    paths: List[str] = []
+    for record in run_git_streaming(
+        ["git", "log", f"--pretty=format:{log_format}", "--name-status", "-z", "--date-order", "--all"],
+        cwd=repo_path,
+        separator='\0'
+    ):
+        if record.startswith(COMMIT_SENTINEL):
+            header, _, status = record[1:].partition('\n')
+            files = None
+            paths = []
+            parts = header.split('|', 4)
+            if len(parts) == 5:
+                sha, author, email, date, message = parts
+                on_head = sha in head_shas
+                files = []
+                commits.append({
+                    "sha": sha,
+                    "author": author,
+                    "email": email,
+                    "date": date,
+                    "message": message,
+                    "files": files
+                })
             continue
-        parts = line.split('|', 4)
-        if len(parts) == 5:
-            sha, author, email, date, message = parts
-            commits.append({
-                "sha": sha,
-                "author": author,
-                "email": email,
-                "date": date,
-                "message": message
-            })
+        
+        if not record or files is None:
+            continue
+        
+        if not status:
+            status = record
+            continue
+        
+        paths.append(record)
+        if len(paths) < (2 if status[0] in 'RC' else 1):
+            continue
+        
+        index = len(commits) - 1
+        # A rename lists both paths, as it did before rename detection
+        files.extend(paths)
+        # Only HEAD's history is indexed by file
+        if on_head and status.startswith('R'):
+            old_path, new_path = paths
+            file_commits.setdefault(new_path, []).append((index, old_path))
+            file_commits.setdefault(old_path, []).append((index, None))
+        elif on_head:
+            for path in paths:
+                file_commits.setdefault(path, []).append((index, None))
+        status = None
+        paths = []
+    
+    return {
+        "commits": commits,
+        "files": file_commits,
+        "prefix": prefix
+    }
+
+
+def get_file_history(commit_index: Dict[str, Any], file_path: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Get (path at that commit, commit) pairs for all commits that modified a file.
+
+    Commits are newest first and renames are followed, like git log --follow.
+    file_path is relative to the directory the index was built from.
+    """
+    history = []
+    
+    path = os.path.normpath(commit_index["prefix"] + file_path)
+    # Only commits older than the rename are followed under the old path
+    older_than = -1
+    while path:
+        previous_path = None
+        for index, old_path in commit_index["files"].get(path, []):
+            if index <= older_than:
+                continue
+            commit = commit_index["commits"][index]
+            history.append((path, {
+                "sha": commit["sha"],
+                "author": commit["author"],
+                "email": commit["email"],
+                "date": commit["date"],
+                "message": commit["message"]
+            }))
+            if old_path:
+                previous_path, older_than = old_path, index
+                break
+        path = previous_path
     
-    return commits
+    return history
 
 
 def get_blame_history(repo_path: str, click_file_path: str) -> List[Dict[str, Any]]:
-    """Get complete blame information for each line in the click.md file."""
+    """Get complete blame information for each line range in the click.md file.
+
+    One record is emitted per blame hunk (a run of consecutive lines from
+    the same commit), with the hunk's lines joined by newlines as content.
+    """
     blame_info = []
     
     # Check if file exists
@@ -112,149 +262,164 @@ def get_blame_history(repo_path: str, click_file_path: str) -> List[Dict[str, An
     if not os.path.exists(full_path):
         return blame_info
     
-    # Use git blame with porcelain format for detailed info
-    output = run_git_command(
-        ["git", "blame", "--line-porcelain", click_file_path],
-        cwd=repo_path
-    )
+    sha = None
+    hunk_lines = None
     
-    if not output:
-        return blame_info
-    
-    lines = output.split('\n')
-    i = 0
-    current_line = 1
+    # Plain --porcelain only emits a commit's metadata the first time the
+    # commit appears, so it is cached by SHA and reused for later lines
+    commit_meta: Dict[str, Dict[str, str]] = {}
     
-    while i < len(lines):
-        if not lines[i]:
-            i += 1
-            continue
-            
-        # First line contains: SHA original_line current_line [num_lines]
-        parts = lines[i].split()
-        if len(parts) < 3:
-            i += 1
-            continue
-            
-        sha = parts[0]
-        original_line = int(parts[1])
-        
-        # Parse the following metadata lines
-        author = ""
-        email = ""
-        date = ""
-        content = ""
-        
-        i += 1
-        while i < len(lines) and not lines[i].startswith('\t'):
-            if lines[i].startswith('author '):
-                author = lines[i][7:]
-            elif lines[i].startswith('author-mail '):
-                email = lines[i][12:].strip('<>')
-            elif lines[i].startswith('author-time '):
-                timestamp = int(lines[i][12:])
-                date = datetime.fromtimestamp(timestamp).isoformat() + 'Z'
-            i += 1
-        
-        # Content line starts with tab
-        if i < len(lines) and lines[i].startswith('\t'):
-            content = lines[i][1:]
-            i += 1
-        
-        blame_info.append({
-            "lineStart": current_line,
-            "lineEnd": current_line,
-            "commit": sha,
-            "author": author,
-            "email": email,
-            "date": date,
-            "content": content,
-            "originalLineStart": original_line
-        })
-        
-        current_line += 1
+    # Use git blame with porcelain format for detailed info, consumed as a
+    # stream so the full output is never held in memory
+    for line in run_git_streaming(
+        ["git", "blame", "--porcelain", click_file_path],
+        cwd=repo_path
+    ):
+        if line.startswith('\t'):
+            # Content line starts with tab and ends the entry
+            if sha is None or hunk_lines is None:
+                continue
+            hunk_lines.append(line[1:])
+            if len(hunk_lines) == hunk_size:
+                blame_info.append({
+                    "lineStart": hunk_start,
+                    "lineEnd": hunk_start + hunk_size - 1,
+                    "commit": sha,
+                    "author": meta["author"],
+                    "email": meta["email"],
+                    "date": meta["date"],
+                    "content": '\n'.join(hunk_lines),
+                    "originalLineStart": original_line
+                })
+                hunk_lines = None
+            sha = None
+        elif sha is None:
+            # Header line contains: SHA original_line final_line [num_lines],
+            # where num_lines is only present on the first line of a hunk
+            parts = line.split()
+            if len(parts) < 3:
+                continue
+            sha = parts[0]
+            if len(parts) >= 4:
+                original_line = int(parts[1])
+                hunk_start = int(parts[2])
+                hunk_size = int(parts[3])
+                hunk_lines = []
+            meta = commit_meta.get(sha)
+            if meta is None:
+                meta = commit_meta[sha] = {"author": "", "email": "", "date": ""}
+        elif line.startswith('author '):
+            meta["author"] = line[7:]
+        elif line.startswith('author-mail '):
+            meta["email"] = line[12:].strip('<>')
+        elif line.startswith('author-time '):
+            # Formatted once per commit, straight from the UTC struct_time
+            timestamp = int(line[12:])
+            meta["date"] = "%04d-%02d-%02dT%02d:%02d:%02dZ" % time.gmtime(timestamp)[:6]
     
     return blame_info
 
 
-def get_current_content(repo_path: str, click_file_path: str) -> str:
-    """Get the current content of the click.md file."""
+def get_blob_oid(repo_path: str, file_path: str) -> str:
+    """Get the git object id of a working tree file's current content."""
+    return run_git_command(["git", "hash-object", "--", file_path], cwd=repo_path)
+
+
+def load_blame_cache(cache_path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Load the blame records cached by a previous run, keyed by click.md path, content oid and last commit."""
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(cache, dict) or cache.get("version") != BLAME_CACHE_VERSION:
+        return {}
+    return cache.get("blame", {})
+
+
+def get_current_content(repo_path: str, click_file_path: str) -> Tuple[str, Set[str]]:
+    """Get the current content of the click.md file and the images it references.
+
+    The file is memory-mapped and scanned for images in place, then decoded
+    to text once for the output, so its raw bytes are never copied.
+    """
     full_path = os.path.join(repo_path, click_file_path)
     if os.path.exists(full_path):
-        with open(full_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    return ""
+        with open(full_path, 'rb') as f:
+            # Empty files cannot be mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return "", set()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return decode_content(mm), extract_image_references(mm)
+    return "", set()
 
 
-def extract_image_references(markdown_content: str) -> Set[str]:
-    """Extract all image references from markdown content."""
+def decode_content(content: Union[bytes, mmap.mmap]) -> str:
+    """Decode file content as UTF-8 text with universal newlines, like open() in text mode."""
+    text = str(content, 'utf-8')
+    if b'\r' in content:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def extract_image_references(markdown_content: Union[bytes, mmap.mmap]) -> Set[str]:
+    """Extract all image references from raw markdown content."""
     images = set()
     
     # Match markdown image syntax: ![alt](path)
-    markdown_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    for match in re.finditer(markdown_pattern, markdown_content):
-        image_path = match.group(2)
+    for match in _MD_IMG_RE.finditer(markdown_content):
+        image_path = match.group(2).decode('utf-8')
         # Skip external URLs
-        if not image_path.startswith(('http://', 'https://', '//')):
+        if not image_path.startswith(_EXTERNAL_URL_PREFIXES):
             images.add(image_path)
     
     # Match HTML img tags: <img src="path">
-    html_pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-    for match in re.finditer(html_pattern, markdown_content):
-        image_path = match.group(1)
+    for match in _HTML_IMG_RE.finditer(markdown_content):
+        image_path = match.group(1).decode('utf-8')
         # Skip external URLs
-        if not image_path.startswith(('http://', 'https://', '//')):
+        if not image_path.startswith(_EXTERNAL_URL_PREFIXES):
             images.add(image_path)
     
     return images
 
 
-def get_image_history(repo_path: str, image_path: str) -> List[Dict[str, Any]]:
-    """Get the commit history for a specific image file."""
-    history = []
-    
-    # Check if the file exists
-    full_path = os.path.join(repo_path, image_path)
-    if not os.path.exists(full_path):
-        return history
-    
-    # Get commit info for the image file with format: SHA|AUTHOR|EMAIL|DATE|MESSAGE
-    log_format = "%H|%an|%ae|%aI|%s"
-    output = run_git_command(
-        ["git", "log", f"--pretty=format:{log_format}", "--follow", "--", image_path],
-        cwd=repo_path
-    )
-    
-    if not output:
-        return history
+def _fast_copy(source_path: str, dest_path: str) -> None:
+    """Copy a file into the assets directory without rewriting its bytes where possible.
+
+    Tries a hardlink first, then an in-kernel copy_file_range (a reflink on
+    copy-on-write filesystems), and falls back to shutil.copy2.
+    """
+    if os.path.lexists(dest_path):
+        if os.path.exists(dest_path) and os.path.samefile(source_path, dest_path):
+            # Already linked by a previous run
+            return
+        # Never write through an existing destination: it may be a hardlink
+        # to a source file
+        os.unlink(dest_path)
     
-    for line in output.split('\n'):
-        if not line:
-            continue
-        parts = line.split('|', 4)
-        if len(parts) == 5:
-            sha, author, email, date, message = parts
-            
-            # Get file size at this commit
-            size_output = run_git_command(
-                ["git", "show", f"{sha}:{image_path}"],
-                cwd=repo_path
-            )
-            file_size = len(size_output.encode()) if size_output else 0
-            
-            history.append({
-                "sha": sha,
-                "author": author,
-                "email": email,
-                "date": date,
-                "message": message,
-                "size": file_size
-            })
+    try:
+        os.link(source_path, dest_path)
+        return
+    except (OSError, NotImplementedError):
+        # Different filesystem, or links not supported
+        pass
     
-    return history
+    try:
+        with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(source_path, dest_path)
+    except (AttributeError, OSError):
+        # copy_file_range is Linux only
+        shutil.copy2(source_path, dest_path)
 
 
-def copy_images_to_assets(repo_path: str, project_path: str, project_git_root: str, image_refs: Set[str], assets_dir: str) -> List[Dict[str, Any]]:
+def copy_images_to_assets(repo_path: str, project_path: str, project_git_root: str, commit_index: Dict[str, Any], image_refs: Set[str], assets_dir: str) -> List[Dict[str, Any]]:
     """Copy images referenced in click.md to the assets directory and track their history."""
     copied_images = []
     
@@ -265,66 +430,104 @@ def copy_images_to_assets(repo_path: str, project_path: str, project_git_root: s
     os.makedirs(assets_dir, exist_ok=True)
     
     project_dir = os.path.join(repo_path, project_path)
+    project_name = os.path.basename(project_path)
+    is_external = project_path.startswith("external-projects")
     
+    found_images = []
     for image_ref in image_refs:
-        # Handle relative paths
-        source_path = os.path.join(project_dir, image_ref)
+        # Handle relative paths. normpath is pure Python and comparatively
+        # slow, so it only runs for paths that actually need normalizing
+        if image_ref.startswith('/') or '..' in image_ref or './' in image_ref:
+            source_path = os.path.normpath(os.path.join(project_dir, image_ref))
+        else:
+            source_path = f"{project_dir}/{image_ref}"
         
-        # Normalize the path
-        source_path = os.path.normpath(source_path)
+        # A single stat answers existence, file type and current size
+        try:
+            source_stat = os.stat(source_path)
+        except OSError:
+            source_stat = None
+        if source_stat is None or not stat.S_ISREG(source_stat.st_mode):
+            print(f"  Warning: Image not found: {image_ref}", file=sys.stderr)
+            continue
         
-        if os.path.exists(source_path) and os.path.isfile(source_path):
-            # Create a unique name based on project and original filename
-            project_name = os.path.basename(project_path)
-            filename = os.path.basename(image_ref)
-            
-            # Preserve directory structure if image is in subdirectory
-            rel_dir = os.path.dirname(image_ref)
-            if rel_dir and rel_dir != '.':
-                dest_subdir = os.path.join(assets_dir, project_name, rel_dir)
-                os.makedirs(dest_subdir, exist_ok=True)
-                dest_path = os.path.join(dest_subdir, filename)
-                # Path relative to assets_dir for web
-                web_path = os.path.join(project_name, rel_dir, filename).replace('\\', '/')
-            else:
-                dest_path = os.path.join(assets_dir, f"{project_name}_{filename}")
-                web_path = f"{project_name}_{filename}"
-            
-            # Get the image path relative to the git repository root
-            is_external = project_path.startswith("external-projects")
-            if is_external:
-                # For external projects, the image path is relative to the external project root
-                image_git_path = image_ref
-            else:
-                # For local projects, include the project path
-                image_git_path = os.path.join(project_path, image_ref)
-            
-            # Get the version history of this image
-            image_history = get_image_history(project_git_root, image_git_path)
-            
-            try:
-                shutil.copy2(source_path, dest_path)
-                
-                # Get current file size
-                current_size = os.path.getsize(source_path)
-                
-                copied_images.append({
-                    "source": image_ref,
-                    "destination": web_path,
-                    "fullPath": dest_path,
-                    "currentSize": current_size,
-                    "versions": image_history,
-                    "versionCount": len(image_history)
-                })
-                print(f"  Copied image: {image_ref} -> assets/{web_path} ({len(image_history)} versions)")
-            except Exception as e:
-                print(f"  Warning: Could not copy image {image_ref}: {e}", file=sys.stderr)
+        # Get the image path relative to the git repository root
+        if is_external:
+            # For external projects, the image path is relative to the external project root
+            image_git_path = image_ref
         else:
-            print(f"  Warning: Image not found: {image_ref}", file=sys.stderr)
+            # For local projects, include the project path
+            # (get_file_history normalizes it)
+            image_git_path = f"{project_path}/{image_ref}"
+        found_images.append((image_ref, source_path, image_git_path, source_stat.st_size))
+    
+    # Get the version history of each image
+    file_histories = [get_file_history(commit_index, image_git_path) for _, _, image_git_path, _ in found_images]
+    histories = [[version for _, version in file_history] for file_history in file_histories]
+    
+    # Size of each image version, answered by a single cat-file process.
+    # Object names use the path the image had at that commit
+    object_names = [
+        f"{version['sha']}:{path}"
+        for file_history in file_histories
+        for path, version in file_history
+    ]
+    sizes = iter(get_object_sizes(project_git_root, object_names))
+    for image_history in histories:
+        for version in image_history:
+            version["size"] = next(sizes, 0)
+    
+    for (image_ref, source_path, image_git_path, current_size), image_history in zip(found_images, histories):
+        # Create a unique name based on project and original filename
+        filename = os.path.basename(image_ref)
+        
+        # Preserve directory structure if image is in subdirectory
+        rel_dir = os.path.dirname(image_ref)
+        if rel_dir and rel_dir != '.':
+            dest_subdir = f"{assets_dir}/{project_name}/{rel_dir}"
+            os.makedirs(dest_subdir, exist_ok=True)
+            dest_path = f"{dest_subdir}/{filename}"
+            # Path relative to assets_dir for web
+            web_path = f"{project_name}/{rel_dir}/{filename}"
+        else:
+            dest_path = f"{assets_dir}/{project_name}_{filename}"
+            web_path = f"{project_name}_{filename}"
+        
+        try:
+            _fast_copy(source_path, dest_path)
+            
+            copied_images.append({
+                "source": image_ref,
+                "destination": web_path,
+                "fullPath": dest_path,
+                "currentSize": current_size,
+                "versions": image_history,
+                "versionCount": len(image_history)
+            })
+            print(f"  Copied image: {image_ref} -> assets/{web_path} ({len(image_history)} versions)")
+        except Exception as e:
+            print(f"  Warning: Could not copy image {image_ref}: {e}", file=sys.stderr)
     
     return copied_images
 
 
+def list_click_md_dirs(git_root: str, pathspec: str = ".") -> List[str]:
+    """List directories (relative to git_root) containing a click.md file, using the git index."""
+    # Tracked plus untracked-but-not-ignored files, so new projects are found
+    # before they are committed and ignored trees are never visited
+    output = run_git_command(
+        ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", pathspec],
+        cwd=git_root
+    )
+    
+    click_dirs = set()
+    for file_path in output.split('\0'):
+        if os.path.basename(file_path).lower() == "click.md" and os.path.isfile(os.path.join(git_root, file_path)):
+            click_dirs.add(os.path.dirname(file_path))
+    
+    return sorted(click_dirs)
+
+
 def find_projects(repo_path: str) -> List[str]:
     """Find all projects (directories containing click.md files)."""
     projects = []
@@ -344,11 +547,7 @@ def find_projects(repo_path: str) -> List[str]:
     # Look for click.md files in the projects directory (local projects)
     projects_dir = os.path.join(repo_path, "projects")
     if os.path.exists(projects_dir):
-        for root, dirs, files in os.walk(projects_dir):
-            if has_click_md(files):
-                # Get the relative path from repo root
-                rel_path = os.path.relpath(root, repo_path)
-                projects.append(rel_path)
+        projects.extend(list_click_md_dirs(repo_path, "projects"))
     
     # Look for click.md files in external-projects directory (external repos)
     external_projects_dir = os.path.join(repo_path, "external-projects")
@@ -362,9 +561,19 @@ def find_projects(repo_path: str) -> List[str]:
                 if click_filename:
                     rel_path = os.path.relpath(project_path, repo_path)
                     projects.append(rel_path)
+                elif os.path.exists(os.path.join(project_path, ".git")):
+                    # Search subdirectories through the external repository's index
+                    click_dirs = list_click_md_dirs(project_path)
+                    if click_dirs:
+                        # Only take the shallowest click.md found in each external project
+                        click_dir = min(click_dirs, key=lambda d: (d.count('/'), d))
+                        rel_path = os.path.relpath(os.path.join(project_path, click_dir), repo_path)
+                        projects.append(rel_path)
                 else:
-                    # Also search subdirectories of external project
+                    # Not a git checkout: search subdirectories of external project
                     for root, dirs, files in os.walk(project_path):
+                        # Don't descend into VCS, dependency or build directories
+                        dirs[:] = [d for d in dirs if d not in _SKIP_DIRS]
                         if has_click_md(files):
                             rel_path = os.path.relpath(root, repo_path)
                             projects.append(rel_path)
@@ -373,8 +582,122 @@ def find_projects(repo_path: str) -> List[str]:
     return projects
 
 
-def generate_temporal_data(repo_path: str, output_file: str) -> None:
-    """Generate the complete temporal data model for all projects."""
+def dumps_json(data: Any, indent: bool = True) -> bytes:
+    """Serialize data to JSON, using orjson when it is available."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+def write_json(path: str, data: Any, indent: bool = True) -> None:
+    """Write data to a JSON file."""
+    with open(path, 'wb') as f:
+        f.write(dumps_json(data, indent))
+
+
+def _project_git_root(repo_path: str, project_path: str) -> str:
+    """Get the git repository a project's history lives in."""
+    # For external projects, use the external project's git repository
+    # For local projects, use the main repository
+    if project_path.startswith("external-projects"):
+        return os.path.join(repo_path, project_path)
+    return repo_path
+
+
+def _init_worker(commit_indexes: Dict[str, Dict[str, Any]], blame_cache: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Install the commit indexes and blame cache in a worker process, once rather than with every task."""
+    _commit_indexes.update(commit_indexes)
+    _blame_cache.update(blame_cache)
+
+
+def _process_project(repo_path: str, project_path: str, assets_dir: str) -> Optional[Dict[str, Any]]:
+    """Extract the temporal data for a single project."""
+    project_name = os.path.basename(project_path)
+    
+    # Find the actual click.md filename (case insensitive)
+    project_full_path = os.path.join(repo_path, project_path)
+    click_filename = None
+    for f in os.listdir(project_full_path):
+        if f.lower() == "click.md" and os.path.isfile(os.path.join(project_full_path, f)):
+            click_filename = f
+            break
+    
+    if not click_filename:
+        print(f"Warning: click.md not found in {project_path}")
+        return None
+        
+    click_file_path = os.path.join(project_path, click_filename)
+    
+    project_git_root = _project_git_root(repo_path, project_path)
+    if project_git_root != repo_path:
+        # click.md path relative to the external project root
+        click_file_rel_path = click_filename
+    else:
+        click_file_rel_path = click_file_path
+    
+    commit_index = _commit_indexes[project_git_root]
+    
+    # Get click.md specific commits
+    click_commits = [commit for _, commit in get_file_history(commit_index, click_file_rel_path)]
+    print(f"  Found {len(click_commits)} commits for click.md")
+    
+    # Get blame history, reusing the previous run's records if click.md is
+    # unchanged. The blob oid changes if and only if the content does, and
+    # the last commit to touch click.md changes whenever its history does
+    # (e.g. an edit committed and then reverted back to the same content)
+    blob_oid = get_blob_oid(project_git_root, click_file_rel_path)
+    last_sha = click_commits[0]["sha"] if click_commits else ""
+    blame_cache_key = f"{click_file_path}:{blob_oid}:{last_sha}" if blob_oid else None
+    blame_history = _blame_cache.get(blame_cache_key)
+    if blame_history is not None:
+        blame_source = "Reused cached"
+    else:
+        blame_source = "Extracted"
+        blame_history = get_blame_history(project_git_root, click_file_rel_path)
+    # Uncommitted lines are re-attributed once committed, and an empty result
+    # may be a failed blame, so neither is cached
+    if not blame_history or any(record["commit"] == UNCOMMITTED_SHA for record in blame_history):
+        blame_cache_key = None
+    line_count = blame_history[-1]["lineEnd"] if blame_history else 0
+    print(f"  {blame_source} blame history for {line_count} lines in {len(blame_history)} ranges")
+    
+    # Get current content and the images it references
+    current_content, image_refs = get_current_content(repo_path, click_file_path)
+    
+    # Copy images
+    copied_images = copy_images_to_assets(repo_path, project_path, project_git_root, commit_index, image_refs, assets_dir)
+    
+    # The repository's commits are filled in by generate_temporal_data, which
+    # reads them once per git root
+    return {
+        "name": project_name,
+        "path": project_path,
+        "blameCacheKey": blame_cache_key,
+        "clickFile": {
+            "path": click_file_path,
+            "commits": click_commits,
+            "blameHistory": blame_history,
+            "currentContent": current_content,
+            "images": copied_images
+        }
+    }
+
+
+def _process_project_captured(repo_path: str, project_path: str, assets_dir: str) -> Tuple[Optional[Dict[str, Any]], str, str]:
+    """Run _process_project in a worker, capturing its output so logs from parallel projects don't interleave."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        project_data = _process_project(repo_path, project_path, assets_dir)
+    return project_data, stdout.getvalue(), stderr.getvalue()
+
+
+def generate_temporal_data(repo_path: str, output_file: str, blame_cache_file: str = ".blame-cache.json") -> None:
+    """Generate the complete temporal data model for all projects.
+
+    The blame cache is kept outside the output directory, which is published
+    as is.
+    """
     print(f"Generating temporal data for repository: {repo_path}")
     
     # Find all projects
@@ -388,92 +711,83 @@ def generate_temporal_data(repo_path: str, output_file: str) -> None:
     output_dir = os.path.dirname(output_file)
     assets_dir = os.path.join(output_dir, "assets")
     
-    projects_data = []
-    
-    for project_path in project_paths:
-        project_name = os.path.basename(project_path)
-        
-        # Find the actual click.md filename (case insensitive)
-        project_full_path = os.path.join(repo_path, project_path)
-        click_filename = None
-        for f in os.listdir(project_full_path):
-            if f.lower() == "click.md" and os.path.isfile(os.path.join(project_full_path, f)):
-                click_filename = f
-                break
-        
-        if not click_filename:
-            print(f"Warning: click.md not found in {project_path}")
-            continue
+    output_path = os.path.join(repo_path, output_file)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    blame_cache_path = os.path.join(repo_path, blame_cache_file)
+    blame_cache = load_blame_cache(blame_cache_path)
+    new_blame_cache = {}
+    
+    project_count = 0
+    
+    # Local projects all share the main repository, so its commit log is
+    # read and indexed once per git root rather than once per project
+    git_roots = list(dict.fromkeys(_project_git_root(repo_path, p) for p in project_paths))
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        commit_indexes = dict(zip(git_roots, executor.map(get_commit_index, git_roots)))
+    
+    # Projects are independent (own click.md, and own git repository for
+    # external projects), so extract them in parallel. Each project is
+    # written out as soon as it arrives rather than collected in memory;
+    # the layout matches a single indented dump of the whole structure.
+    # The file is written under a temporary name so a failed run never
+    # leaves a truncated output behind
+    partial_output_path = output_path + ".partial"
+    try:
+        with open(partial_output_path, 'wb') as output, ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(commit_indexes, blame_cache)
+        ) as executor:
+            output.write(b'{\n  "projects": [')
+            results = executor.map(
+                partial(_process_project_captured, repo_path, assets_dir=assets_dir),
+                project_paths
+            )
+            for project_data, out, err in results:
+                if project_data is None:
+                    sys.stdout.write(out)
+                    sys.stderr.write(err)
+                    continue
             
-        click_file_path = os.path.join(project_path, click_filename)
-        
-        print(f"\nProcessing project: {project_name}")
-        
-        # Determine if this is an external project
-        is_external = project_path.startswith("external-projects")
-        
-        # For external projects, use the external project's git repository
-        # For local projects, use the main repository
-        if is_external:
-            project_git_root = os.path.join(repo_path, project_path)
-            # click.md path relative to the external project root
-            click_file_rel_path = click_filename
-        else:
-            project_git_root = repo_path
-            click_file_rel_path = click_file_path
-        
-        # Get all commits for the project repository
-        all_commits = get_all_commits(project_git_root)
-        print(f"  Found {len(all_commits)} total commits in project repository")
-        
-        # Get click.md specific commits
-        click_commits = get_click_file_commits(project_git_root, click_file_rel_path)
-        print(f"  Found {len(click_commits)} commits for click.md")
-        
-        # Get blame history
-        blame_history = get_blame_history(project_git_root, click_file_rel_path)
-        print(f"  Extracted blame history for {len(blame_history)} lines")
-        
-        # Get current content
-        current_content = get_current_content(repo_path, click_file_path)
-        
-        # Extract and copy images
-        image_refs = extract_image_references(current_content)
-        copied_images = copy_images_to_assets(repo_path, project_path, project_git_root, image_refs, assets_dir)
+                all_commits = commit_indexes[_project_git_root(repo_path, project_data["path"])]["commits"]
+                print(f"\nProcessing project: {project_data['name']}")
+                print(f"  Found {len(all_commits)} total commits in project repository")
+                sys.stdout.write(out)
+                sys.stderr.write(err)
+                if project_data["blameCacheKey"]:
+                    new_blame_cache[project_data["blameCacheKey"]] = project_data["clickFile"]["blameHistory"]
+            
+                project_json = dumps_json({
+                    "name": project_data["name"],
+                    "path": project_data["path"],
+                    "commits": all_commits,
+                    "clickFile": project_data["clickFile"]
+                })
+                # Newlines only occur between tokens (strings escape them), so
+                # this re-indents the project to its depth in the document
+                output.write(b',\n    ' if project_count else b'\n    ')
+                output.write(project_json.replace(b'\n', b'\n    '))
+                project_count += 1
         
-        project_data = {
-            "name": project_name,
-            "path": project_path,
-            "commits": all_commits,
-            "clickFile": {
-                "path": click_file_path,
-                "commits": click_commits,
-                "blameHistory": blame_history,
-                "currentContent": current_content,
-                "images": copied_images
+            metadata = {
+                "generatedAt": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+                "version": "1.0.0"
             }
-        }
-        
-        projects_data.append(project_data)
-    
-    # Create the complete data structure
-    data = {
-        "projects": projects_data,
-        "metadata": {
-            "generatedAt": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "version": "1.0.0"
-        }
-    }
-    
-    # Write to output file
-    output_path = os.path.join(repo_path, output_file)
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+            output.write(b'\n  ],\n  "metadata": ' if project_count else b'],\n  "metadata": ')
+            output.write(dumps_json(metadata).replace(b'\n', b'\n  '))
+            output.write(b'\n}')
+    except BaseException:
+        # Don't leave the partial output in the published directory
+        with contextlib.suppress(OSError):
+            os.remove(partial_output_path)
+        raise
+    os.replace(partial_output_path, output_path)
+    
+    # Only entries for the current click.md contents are kept
+    write_json(blame_cache_path, {"version": BLAME_CACHE_VERSION, "blame": new_blame_cache}, indent=False)
     
     print(f"\nTemporal data written to: {output_path}")
-    print(f"Total projects processed: {len(projects_data)}")
+    print(f"Total projects processed: {project_count}")
 
 
 def main():
@@ -488,12 +802,17 @@ def main():
     else:
         output_file = "dist/temporal-data.json"
     
+    if len(sys.argv) > 3:
+        blame_cache_file = sys.argv[3]
+    else:
+        blame_cache_file = ".blame-cache.json"
+    
     # Validate that we're in a git repository
     if not os.path.exists(os.path.join(repo_path, ".git")):
         print(f"Error: {repo_path} is not a git repository", file=sys.stderr)
         sys.exit(1)
     
-    generate_temporal_data(repo_path, output_file)
+    generate_temporal_data(repo_path, output_file, blame_cache_file)
     print("\nDone!")
 
 
@@ -89,7 +89,7 @@ function renderTimeline() {
     // Track lines for navigation
     const project = commit.getProject();
     const blameLines = project
-      .getBlameHistory()
+      .getBlameLines()
       .filter((line) => line.commit === commit.sha);
 
     blameLines.forEach((line) => {
@@ -127,7 +127,7 @@ function createCommitElement(commit, index) {
 
   // Get blame lines for this commit
   const blameLines = project
-    .getBlameHistory()
+    .getBlameLines()
     .filter((line) => line.commit === commit.sha);
 
   let linesHTML = "";
@@ -206,7 +206,7 @@ function hasEarlierCommit(line, currentCommit) {
   const allCommitsForLine = client.getAllCommits().filter((c) => {
     const project = c.getProject();
     return project
-      .getBlameHistory()
+      .getBlameLines()
       .some(
         (bl) =>
           hashLine(bl) === lineHash &&
@@ -230,7 +230,7 @@ function handleLineClick(lineElement) {
   const earlierCommits = allCommits.filter((c) => {
     const project = c.getProject();
     const hasLine = project
-      .getBlameHistory()
+      .getBlameLines()
       .some((bl) => hashLine(bl) === lineHash);
     return hasLine && new Date(c.date) < new Date(currentCommit.date);
   });
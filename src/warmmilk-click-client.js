@@ -169,6 +169,14 @@ class Project {
     return this.getClickFile().getBlameHistory();
   }
 
+  /**
+   * Get the blame history for click.md split into single lines
+   * @returns {BlameLine[]}
+   */
+  getBlameLines() {
+    return this.getClickFile().getBlameLines();
+  }
+
   //TODO: get blame history sequential chunks by commit.
 
   /**
@@ -226,7 +234,10 @@ class Project {
       totalCommits: commits.length,
       clickFileCommits: clickFileCommits.length,
       totalImages: images.length,
-      linesTracked: blameHistory.length,
+      linesTracked: blameHistory.reduce(
+        (count, line) => count + line.lineEnd - line.lineStart + 1,
+        0
+      ),
       authors: [...new Set(commits.map((c) => c.author))],
       dateRange: {
         first: commits.length > 0 ? commits[commits.length - 1].date : null,
@@ -259,6 +270,14 @@ class ClickFile {
     return (this.data.blameHistory || []).map((b) => new BlameLine(b, this));
   }
 
+  /**
+   * Get blame history split into single lines
+   * @returns {BlameLine[]}
+   */
+  getBlameLines() {
+    return this.getBlameHistory().flatMap((b) => b.getLines());
+  }
+
   /**
    * Get images referenced in this file
    * @returns {ImageAsset[]}
@@ -410,6 +429,29 @@ class BlameLine {
     return this.getDate().toLocaleDateString(locale);
   }
 
+  /**
+   * Split this line range into one BlameLine per line
+   * @returns {BlameLine[]}
+   */
+  getLines() {
+    if (this.lineEnd <= this.lineStart) {
+      return [this];
+    }
+    return (this.content || "").split("\n").map(
+      (content, i) =>
+        new BlameLine(
+          {
+            ...this.data,
+            lineStart: this.lineStart + i,
+            lineEnd: this.lineStart + i,
+            content,
+            originalLineStart: this.originalLineStart + i,
+          },
+          this.clickFile
+        )
+    );
+  }
+
   /**
    * Check if this is an empty line
    * @returns {boolean}